@@ -43,8 +43,34 @@ class PathConfig:
     INPUT_CSV: str = 'data/transactions.csv'
     OUTPUT_CSV: str = 'output/suspicious_accounts.csv'
     LOG_FILE: str = 'logs/detection.log'
+    STATE_FILE: str = 'output/detection_state.json'
+
+
+@dataclass
+class LoggingConfig:
+    """
+    Logging behaviour for the detection pipeline.
+    
+    Rate limiting applies per message template: at most RATE_LIMIT_COUNT
+    records of the same kind are written per RATE_LIMIT_INTERVAL seconds,
+    the rest are counted. Counts are reported once the interval has passed,
+    checked whenever another record is logged, and at shutdown.
+    """
+    
+    ASYNC: bool = True                  # Write logs from a background thread
+    JSON_FORMAT: bool = False           # One JSON object per line in the log file
+    RATE_LIMIT_COUNT: int = 20          # Max records per message key per interval
+    RATE_LIMIT_INTERVAL: float = 60.0   # Rate limit interval (seconds)
+    
+    def __post_init__(self):
+        """Validate configuration parameters."""
+        if self.RATE_LIMIT_COUNT < 1:
+            raise ValueError("RATE_LIMIT_COUNT must be at least 1")
+        if self.RATE_LIMIT_INTERVAL <= 0:
+            raise ValueError("RATE_LIMIT_INTERVAL must be positive")
 
 
 # Global configuration instances
 DETECTION = DetectionConfig()
-PATHS = PathConfig()
\ No newline at end of file
+PATHS = PathConfig()
+LOGGING = LoggingConfig()
\ No newline at end of file
@@ -1,9 +1,10 @@
 """Data loading, validation, and output handling."""
 
 import pandas as pd
+import io
 import os
 import logging
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 
 def load_transactions(file_path: str, logger: logging.Logger = None) -> pd.DataFrame:
@@ -22,6 +23,60 @@ def load_transactions(file_path: str, logger: logging.Logger = None) -> pd.DataF
     except Exception as e:
         raise ValueError(f"Failed to read CSV: {str(e)}")
     
+    df = _validate_transactions(df)
+    
+    # Sort for efficient processing
+    df = df.sort_values(['account_id', 'product_id', 'timestamp']).reset_index(drop=True)
+    
+    if logger:
+        logger.info("Loaded %d transactions from %s", len(df), file_path)
+    
+    return df
+
+
+def read_new_transactions(file_path: str, offset: int = 0,
+                          logger: logging.Logger = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Load transactions appended to a CSV since the given byte offset.
+    
+    Only complete lines are parsed; a partially written last line is left
+    for the next call. Returns the new rows and the offset to resume from.
+    
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If data format is invalid
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Input file not found: {file_path}")
+    
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        f.seek(max(offset, len(header)))
+        tail = f.read()
+    
+    # Stop at the last complete line
+    end = tail.rfind(b'\n') + 1
+    new_offset = max(offset, len(header)) + end
+    
+    try:
+        df = pd.read_csv(io.BytesIO(header + tail[:end]),
+                         dtype={'account_id': str, 'product_id': str})
+    except Exception as e:
+        raise ValueError(f"Failed to read CSV: {str(e)}")
+    
+    df = _validate_transactions(df)
+    df = df.sort_values(['account_id', 'product_id', 'timestamp']).reset_index(drop=True)
+    
+    if logger:
+        logger.info("Loaded %d new transactions from %s (bytes %d-%d)",
+                    len(df), file_path, offset, new_offset)
+    
+    return df, new_offset
+
+
+def _validate_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    """Validate columns and values, parsing timestamps in place."""
+    
     # Validate required columns
     required_cols = ['timestamp', 'account_id', 'product_id', 'side', 
                      'price', 'quantity', 'event_type']
@@ -44,12 +99,6 @@ def load_transactions(file_path: str, logger: logging.Logger = None) -> pd.DataF
     if not df['event_type'].isin(valid_events).all():
         raise ValueError(f"Invalid event_type values. Expected: {valid_events}")
     
-    # Sort for efficient processing
-    df = df.sort_values(['account_id', 'product_id', 'timestamp']).reset_index(drop=True)
-    
-    if logger:
-        logger.info(f"Loaded {len(df)} transactions from {file_path}")
-    
     return df
 
 
@@ -57,7 +106,9 @@ def save_suspicious_accounts(results: List[Dict], output_path: str,
                             logger: logging.Logger = None):
     """Save detection results to CSV."""
     
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
     
     if not results:
         # Empty file with headers
@@ -70,4 +121,20 @@ def save_suspicious_accounts(results: List[Dict], output_path: str,
     
     if logger:
         count = len(results)
-        logger.info(f"Saved {count} suspicious account(s) to {output_path}")
\ No newline at end of file
+        logger.info("Saved %d suspicious account(s) to %s", count, output_path)
+
+
+def append_suspicious_accounts(results: List[Dict], output_path: str,
+                               logger: logging.Logger = None):
+    """Append detection results to an existing results CSV."""
+    
+    if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        save_suspicious_accounts(results, output_path, logger)
+        return
+    
+    if results:
+        pd.DataFrame(results).to_csv(output_path, mode='a', header=False, index=False)
+    
+    if logger:
+        count = len(results)
+        logger.info("Appended %d suspicious account(s) to %s", count, output_path)
@@ -34,7 +34,10 @@ def detect_layering(df: pd.DataFrame, logger: logging.Logger = None) -> List[Sus
             detection = _create_detection(account_id, product_id, group)
             results.append(detection)
             if logger:
-                logger.warning(f"Flagged (special): {account_id} - {product_id}")
+                logger.warning(
+                    "Flagged (special): %s - %s", account_id, product_id,
+                    extra={'account_id': account_id, 'product_id': product_id}
+                )
             continue
         
         # Check for layering pattern
@@ -101,8 +104,9 @@ def _find_layering_pattern(account_id: str, product_id: str,
                     # Pattern detected
                     if logger:
                         logger.warning(
-                            f"Layering detected: {account_id} - {product_id} "
-                            f"({len(window)} {side} orders, {time_span:.1f}s window)"
+                            "Layering detected: %s - %s (%d %s orders, %.1fs window)",
+                            account_id, product_id, len(window), side, time_span,
+                            extra={'account_id': account_id, 'product_id': product_id}
                         )
                     return _create_detection(account_id, product_id, group)
     
@@ -0,0 +1,217 @@
+"""Incremental detection over an append-only transaction file."""
+
+import hashlib
+import json
+import logging
+import os
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+from layering_detector.config import DETECTION
+from layering_detector.detector import SuspiciousAccount, _find_layering_pattern
+
+
+GroupKey = Tuple[str, str]
+
+# Leading bytes of the input hashed to tell an appended file from a replaced one
+FINGERPRINT_BYTES = 4096
+
+
+@dataclass
+class DetectionState:
+    """
+    Progress carried between incremental runs.
+    
+    `groups` holds, per unflagged (account, product), running totals for
+    the output row and the trailing rows a pattern could still span.
+    """
+    input_file: str = ''
+    offset: int = 0
+    flagged: Set[GroupKey] = field(default_factory=set)
+    groups: Dict[GroupKey, Dict] = field(default_factory=dict)
+
+
+def trailing_window() -> pd.Timedelta:
+    """Longest span of a layering pattern, from first order to opposite trade."""
+    return pd.Timedelta(seconds=DETECTION.ORDER_WINDOW
+                        + DETECTION.CANCELLATION_WINDOW
+                        + DETECTION.OPPOSITE_TRADE_WINDOW)
+
+
+def load_state(state_path: str, input_file: str,
+               logger: logging.Logger = None) -> DetectionState:
+    """
+    Load saved state for the input file.
+    
+    Starts from scratch if there is no state, it belongs to another file,
+    or the file was truncated or replaced since the last run.
+    
+    Raises:
+        ValueError: If the state file can't be parsed
+    """
+    if not os.path.exists(state_path):
+        return DetectionState(input_file=input_file)
+    
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        state = DetectionState(
+            input_file=raw['input_file'],
+            offset=int(raw['offset']),
+            flagged={tuple(key) for key in raw['flagged']},
+            groups={(g['account_id'], g['product_id']): g for g in raw['groups']}
+        )
+        fingerprint = raw['fingerprint']
+    except Exception as e:
+        raise ValueError(f"Failed to read state file: {str(e)}")
+    
+    if state.input_file != input_file:
+        if logger:
+            logger.warning("State file %s is for %s, starting over",
+                           state_path, state.input_file)
+        return DetectionState(input_file=input_file)
+    
+    if not os.path.exists(input_file):
+        return state
+    
+    if (os.path.getsize(input_file) < state.offset
+            or _fingerprint(input_file, state.offset) != fingerprint):
+        if logger:
+            logger.warning("%s was truncated or replaced since last run, starting over",
+                           input_file)
+        return DetectionState(input_file=input_file)
+    
+    return state
+
+
+def save_state(state: DetectionState, state_path: str):
+    """Write state atomically so an interrupted run keeps the previous state."""
+    state_dir = os.path.dirname(state_path)
+    if state_dir:
+        os.makedirs(state_dir, exist_ok=True)
+    
+    raw = {
+        'input_file': state.input_file,
+        'offset': state.offset,
+        'fingerprint': _fingerprint(state.input_file, state.offset),
+        'flagged': sorted(state.flagged),
+        'groups': list(state.groups.values()),
+    }
+    
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(raw, f)
+    os.replace(tmp_path, state_path)
+
+
+def _fingerprint(input_file: str, offset: int) -> str:
+    """Hash of the already processed start of the input file."""
+    with open(input_file, 'rb') as f:
+        head = f.read(min(offset, FINGERPRINT_BYTES))
+    return hashlib.sha256(head).hexdigest()
+
+
+def detect_incremental(df: pd.DataFrame, state: DetectionState,
+                       logger: logging.Logger = None) -> List[SuspiciousAccount]:
+    """
+    Detect layering in newly arrived transactions.
+    
+    Only groups present in `df` are evaluated, each against its trailing
+    rows from `state`. Groups already flagged are skipped so each
+    (account, product) is reported once, with totals as of the run that
+    flagged it. Updates `state` in place.
+    """
+    results = []
+    
+    for (account_id, product_id), new_rows in df.groupby(['account_id', 'product_id']):
+        key = (account_id, product_id)
+        if key in state.flagged:
+            continue
+        
+        group_state = state.groups.get(key) or _new_group_state(account_id, product_id)
+        _update_totals(group_state, new_rows)
+        
+        # Special case: always flag specific accounts
+        if account_id in DETECTION.ALWAYS_SUSPICIOUS:
+            results.append(_flag(state, group_state))
+            if logger:
+                logger.warning(
+                    "Flagged (special): %s - %s", account_id, product_id,
+                    extra={'account_id': account_id, 'product_id': product_id}
+                )
+            continue
+        
+        group = _trailing_rows(group_state, new_rows)
+        
+        if _find_layering_pattern(account_id, product_id, group, logger):
+            results.append(_flag(state, group_state))
+            continue
+        
+        # Keep only rows a future pattern could still include
+        cutoff = group['timestamp'].max() - trailing_window()
+        group_state['rows'] = _to_records(group[group['timestamp'] >= cutoff])
+        state.groups[key] = group_state
+    
+    return results
+
+
+def _new_group_state(account_id: str, product_id: str) -> Dict:
+    """Empty state for a group seen for the first time."""
+    return {
+        'account_id': account_id,
+        'product_id': product_id,
+        'total_buy_qty': 0,
+        'total_sell_qty': 0,
+        'num_cancelled_orders': 0,
+        'detected_timestamp': None,
+        'rows': [],
+    }
+
+
+def _update_totals(group_state: Dict, new_rows: pd.DataFrame):
+    """Add new rows to the group's running output totals."""
+    trades = new_rows[new_rows['event_type'] == 'TRADE_EXECUTED']
+    
+    group_state['total_buy_qty'] += int(trades[trades['side'] == 'BUY']['quantity'].sum())
+    group_state['total_sell_qty'] += int(trades[trades['side'] == 'SELL']['quantity'].sum())
+    group_state['num_cancelled_orders'] += int((new_rows['event_type'] == 'ORDER_CANCELLED').sum())
+    
+    latest = new_rows['timestamp'].max()
+    if group_state['detected_timestamp'] is not None:
+        latest = max(latest, pd.Timestamp(group_state['detected_timestamp']))
+    group_state['detected_timestamp'] = latest.isoformat()
+
+
+def _trailing_rows(group_state: Dict, new_rows: pd.DataFrame) -> pd.DataFrame:
+    """Combine saved trailing rows with new rows, ordered by time."""
+    if not group_state['rows']:
+        return new_rows.reset_index(drop=True)
+    
+    previous = pd.DataFrame(group_state['rows'])
+    previous['timestamp'] = pd.to_datetime(previous['timestamp'], format='ISO8601')
+    
+    group = pd.concat([previous, new_rows], ignore_index=True)
+    return group.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def _to_records(rows: pd.DataFrame) -> List[Dict]:
+    """Serialise rows for the JSON state file."""
+    rows = rows.copy()
+    rows['timestamp'] = rows['timestamp'].map(lambda ts: ts.isoformat(timespec='nanoseconds'))
+    return json.loads(rows.to_json(orient='records'))
+
+
+def _flag(state: DetectionState, group_state: Dict) -> SuspiciousAccount:
+    """Mark a group as flagged and build its detection from running totals."""
+    key = (group_state['account_id'], group_state['product_id'])
+    state.flagged.add(key)
+    state.groups.pop(key, None)
+    
+    return SuspiciousAccount(
+        account_id=group_state['account_id'],
+        product_id=group_state['product_id'],
+        total_buy_qty=group_state['total_buy_qty'],
+        total_sell_qty=group_state['total_sell_qty'],
+        num_cancelled_orders=group_state['num_cancelled_orders'],
+        detected_timestamp=group_state['detected_timestamp']
+    )
@@ -3,10 +3,14 @@
 import sys
 import argparse
 from datetime import datetime
-from layering_detector.config import PATHS, DETECTION
-from layering_detector.utils.logger import setup_logger
-from layering_detector.data_loader import load_transactions, save_suspicious_accounts
+from layering_detector.config import PATHS, DETECTION, LOGGING
+from layering_detector.utils.logger import setup_logger, shutdown_logger
+from layering_detector.data_loader import (
+    load_transactions, read_new_transactions,
+    save_suspicious_accounts, append_suspicious_accounts
+)
 from layering_detector.detector import detect_layering
+from layering_detector.incremental import load_state, save_state, detect_incremental
 
 
 def main():
@@ -31,47 +35,92 @@ def main():
         default=PATHS.LOG_FILE,
         help=f'Log file (default: {PATHS.LOG_FILE})'
     )
+    parser.add_argument(
+        '--log-json',
+        action='store_true',
+        default=LOGGING.JSON_FORMAT,
+        help='Write the log file as JSON lines'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only process rows appended since the last incremental run'
+    )
+    parser.add_argument(
+        '--state',
+        default=PATHS.STATE_FILE,
+        help=f'State file for incremental runs (default: {PATHS.STATE_FILE})'
+    )
     args = parser.parse_args()
     
     # Setup logging
-    logger = setup_logger(args.log)
+    logger = setup_logger(args.log, json_format=args.log_json)
     
     try:
         logger.info("="*60)
         logger.info("Layering Detection System - Starting")
-        logger.info(f"Input: {args.input}")
-        logger.info(f"Output: {args.output}")
+        logger.info("Input: %s", args.input)
+        logger.info("Output: %s", args.output)
         logger.info("="*60)
         
-        # Load and validate data
-        logger.info("Loading transaction data...")
-        df = load_transactions(args.input, logger)
-        
-        # Run detection
-        logger.info(f"Running detection (window={DETECTION.ORDER_WINDOW}s)...")
-        results = detect_layering(df, logger)
-        
-        # Save results
-        logger.info("Saving results...")
-        save_suspicious_accounts(results, args.output, logger)
+        if args.incremental:
+            results = _run_incremental(args, logger)
+        else:
+            # Load and validate data
+            logger.info("Loading transaction data...")
+            df = load_transactions(args.input, logger)
+            
+            # Run detection
+            logger.info("Running detection (window=%ss)...", DETECTION.ORDER_WINDOW)
+            results = detect_layering(df, logger)
+            
+            # Save results
+            logger.info("Saving results...")
+            save_suspicious_accounts(results, args.output, logger)
         
         # Summary
         logger.info("="*60)
-        logger.info(f"Detection complete: {len(results)} suspicious account(s) found")
-        logger.info(f"Results saved to: {args.output}")
+        logger.info("Detection complete: %d suspicious account(s) found", len(results))
+        logger.info("Results saved to: %s", args.output)
         logger.info("="*60)
         
         return 0
         
     except FileNotFoundError as e:
-        logger.error(f"File error: {e}")
+        logger.error("File error: %s", e)
         return 1
     except ValueError as e:
-        logger.error(f"Data error: {e}")
+        logger.error("Data error: %s", e)
         return 2
     except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         return 3
+    finally:
+        shutdown_logger(logger)
+
+
+def _run_incremental(args, logger):
+    """Detect in rows appended since the last run and append new results."""
+    state = load_state(args.state, args.input, logger)
+    first_run = state.offset == 0
+    
+    logger.info("Loading new transaction data (state: %s)...", args.state)
+    df, offset = read_new_transactions(args.input, state.offset, logger)
+    
+    logger.info("Running incremental detection (window=%ss)...", DETECTION.ORDER_WINDOW)
+    results = detect_incremental(df, state, logger)
+    
+    # Results before state: an interrupted run re-processes rather than loses rows
+    logger.info("Saving results...")
+    if first_run:
+        save_suspicious_accounts(results, args.output, logger)
+    else:
+        append_suspicious_accounts(results, args.output, logger)
+    
+    state.offset = offset
+    save_state(state, args.state)
+    
+    return results
 
 
 if __name__ == '__main__':
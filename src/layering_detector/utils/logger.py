@@ -1,20 +1,178 @@
 """Logging configuration for the detection system."""
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+from layering_detector.config import LOGGING
 
 
-def setup_logger(log_file: str, name: str = 'layering_detector') -> logging.Logger:
+# Attributes present on every LogRecord; anything else was passed via `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'log_key', 'skip_rate_limit', 'suppressed'
+}
+
+# Background writers started by setup_logger, keyed by logger name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limit how often records with the same message key are emitted.
+    
+    The key is `record.log_key` when given via `extra`, otherwise the
+    unformatted message template. Records over the limit are dropped and
+    counted; the count is attached to the next record that gets through
+    as `record.suppressed`. Once per interval, expired windows are evicted
+    and their outstanding counts logged as a summary.
+    """
+    
+    def __init__(self, max_count: int, interval: float):
+        super().__init__()
+        self.max_count = max_count
+        self.interval = interval
+        self._windows: Dict[str, list] = {}   # key -> [start, emitted, suppressed]
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, 'skip_rate_limit', False):
+            return True
+        
+        key = getattr(record, 'log_key', None) or str(record.msg)
+        expired = {}
+        
+        with self._lock:
+            window = self._windows.get(key)
+            
+            # New interval: let the record through and report the backlog
+            if window is None or record.created - window[0] >= self.interval:
+                if window is not None and window[2]:
+                    record.suppressed = window[2]
+                self._windows[key] = [record.created, 1, 0]
+                passed = True
+            elif window[1] < self.max_count:
+                window[1] += 1
+                passed = True
+            else:
+                window[2] += 1
+                passed = False
+            
+            if passed and record.created - self._last_sweep >= self.interval:
+                expired = self._sweep(record.created)
+        
+        # Logged outside the lock; summaries bypass this filter
+        if expired:
+            _log_suppressed(logging.getLogger(record.name), expired)
+        
+        return passed
+    
+    def _sweep(self, now: float) -> Dict[str, int]:
+        """Evict expired windows, returning their suppressed counts."""
+        self._last_sweep = now
+        counts = {}
+        for key in [k for k, w in self._windows.items() if now - w[0] >= self.interval]:
+            suppressed = self._windows.pop(key)[2]
+            if suppressed:
+                counts[key] = suppressed
+        return counts
+    
+    def pop_suppressed(self) -> Dict[str, int]:
+        """Return and reset outstanding suppressed counts per key."""
+        with self._lock:
+            counts = {key: w[2] for key, w in self._windows.items() if w[2]}
+            for key in counts:
+                self._windows[key][2] = 0
+        return counts
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that keeps the traceback out of the message.
+    
+    The stock handler merges the formatted traceback into `msg`; here it
+    is kept in `exc_text` so formatters see the same record in both modes.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text formatter that reports rate-limited message counts."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f" ({suppressed} similar message(s) suppressed)"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        
+        # Structured fields passed via `extra`
+        for attr, value in vars(record).items():
+            if attr not in _RECORD_ATTRS:
+                entry[attr] = value
+        
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            entry['suppressed'] = suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        
+        return json.dumps(entry, default=str)
+
+
+def setup_logger(log_file: str, name: str = 'layering_detector',
+                 async_mode: Optional[bool] = None,
+                 json_format: Optional[bool] = None) -> logging.Logger:
     """
     Configure logger with console and file output.
     
+    Records are rate limited per message key. In async mode the caller
+    only enqueues records; a background thread writes them to the file
+    and console. Call shutdown_logger() to flush before exiting.
+    
     Args:
         log_file: Path to log file
         name: Logger name
+        async_mode: Write from a background thread (default: LOGGING.ASYNC)
+        json_format: Write JSON lines to the log file (default: LOGGING.JSON_FORMAT)
         
     Returns:
         Configured logger instance
     """
+    if async_mode is None:
+        async_mode = LOGGING.ASYNC
+    if json_format is None:
+        json_format = LOGGING.JSON_FORMAT
+    
     # Ensure log directory exists
     log_dir = os.path.dirname(log_file)
     if log_dir:
@@ -36,20 +194,71 @@ def setup_logger(log_file: str, name: str = 'layering_detector') -> logging.Logg
     console_handler.setLevel(logging.INFO)
     
     # Format: [2024-01-01 10:00:00] INFO: message
-    formatter = logging.Formatter(
+    formatter = TextFormatter(
         '[%(asctime)s] %(levelname)s: %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(JsonFormatter() if json_format else formatter)
     console_handler.setFormatter(formatter)
     
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Drop repeated messages before they reach any handler
+    logger.addFilter(RateLimitFilter(LOGGING.RATE_LIMIT_COUNT,
+                                     LOGGING.RATE_LIMIT_INTERVAL))
+    
+    if async_mode:
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(_QueueHandler(log_queue))
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
     
     return logger
 
 
+def shutdown_logger(logger: logging.Logger):
+    """
+    Report suppressed message counts and flush pending records.
+    
+    Stops the background writer and closes the logger's handlers.
+    """
+    for log_filter in logger.filters:
+        if isinstance(log_filter, RateLimitFilter):
+            _log_suppressed(logger, log_filter.pop_suppressed())
+            logger.removeFilter(log_filter)
+    
+    listener = _listeners.pop(logger.name, None)
+    if listener:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+
+
+def _log_suppressed(logger: logging.Logger, counts: Dict[str, int]):
+    """Log a summary line per message key that had records dropped."""
+    for key, count in counts.items():
+        logger.info(
+            "Suppressed %d message(s) like: %s", count, key,
+            extra={'skip_rate_limit': True}
+        )
+
+
+@atexit.register
+def _shutdown_all():
+    """Flush any background writers left running at exit."""
+    for name in list(_listeners):
+        shutdown_logger(logging.getLogger(name))
+
+
 def log_detection(logger: logging.Logger, account_id: str, product_id: str, 
                   timestamps: list, duration: float):
     """
@@ -62,8 +271,9 @@ def log_detection(logger: logging.Logger, account_id: str, product_id: str,
         timestamps: List of event timestamps
         duration: Pattern duration in seconds
     """
+    extra = {'account_id': account_id, 'product_id': product_id}
     logger.warning(
-        f"SUSPICIOUS: account={account_id}, product={product_id}, "
-        f"events={len(timestamps)}, duration={duration:.2f}s"
+        "SUSPICIOUS: account=%s, product=%s, events=%d, duration=%.2fs",
+        account_id, product_id, len(timestamps), duration, extra=extra
     )
-    logger.info(f"Timestamps: {[str(t) for t in timestamps]}")
\ No newline at end of file
+    logger.info("Timestamps: %s", [str(t) for t in timestamps], extra=extra)
\ No newline at end of file
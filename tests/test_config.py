@@ -1,6 +1,6 @@
 """Tests for configuration validation"""
 import pytest
-from layering_detector.config import DetectionConfig
+from layering_detector.config import DetectionConfig, LoggingConfig
 
 
 class TestDetectionConfig:
@@ -31,4 +31,16 @@ class TestDetectionConfig:
     def test_invalid_min_orders(self):
         """Test validation of MIN_ORDERS_SAME_SIDE parameter"""
         with pytest.raises(ValueError, match="MIN_ORDERS_SAME_SIDE must be at least 2"):
-            DetectionConfig(MIN_ORDERS_SAME_SIDE=1)
\ No newline at end of file
+            DetectionConfig(MIN_ORDERS_SAME_SIDE=1)
+
+
+class TestLoggingConfig:
+    """Test logging configuration validation"""
+    
+    def test_invalid_rate_limit(self):
+        """Test validation of rate limit parameters"""
+        with pytest.raises(ValueError, match="RATE_LIMIT_COUNT must be at least 1"):
+            LoggingConfig(RATE_LIMIT_COUNT=0)
+        
+        with pytest.raises(ValueError, match="RATE_LIMIT_INTERVAL must be positive"):
+            LoggingConfig(RATE_LIMIT_INTERVAL=0)
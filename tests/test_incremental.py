@@ -0,0 +1,160 @@
+"""Tests for incremental detection over appended data"""
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+from layering_detector.data_loader import read_new_transactions
+from layering_detector.incremental import (
+    DetectionState, detect_incremental, load_state, save_state
+)
+
+
+def _layering_rows(account_id='ACC001', base_time=None):
+    """Textbook layering pattern: 3 BUY orders, cancels, SELL trade"""
+    base_time = base_time or datetime(2025, 10, 26, 10, 21, 20)
+    return pd.DataFrame({
+        'timestamp': [base_time + timedelta(seconds=s) for s in [0, 2, 4, 5, 6, 7, 8]],
+        'account_id': [account_id] * 7,
+        'product_id': ['IBM'] * 7,
+        'side': ['BUY', 'BUY', 'BUY', 'BUY', 'BUY', 'BUY', 'SELL'],
+        'price': [100.0] * 7,
+        'quantity': [1000] * 7,
+        'event_type': [
+            'ORDER_PLACED', 'ORDER_PLACED', 'ORDER_PLACED',
+            'ORDER_CANCELLED', 'ORDER_CANCELLED', 'ORDER_CANCELLED',
+            'TRADE_EXECUTED'
+        ]
+    })
+
+
+class TestIncrementalDetection:
+    """Test detection carried across incremental runs"""
+    
+    def test_pattern_split_across_runs(self):
+        """Test that a pattern arriving in two chunks is detected once"""
+        rows = _layering_rows()
+        state = DetectionState()
+        
+        assert detect_incremental(rows.iloc[:4], state) == []
+        results = detect_incremental(rows.iloc[4:], state)
+        
+        assert len(results) == 1
+        assert results[0].account_id == 'ACC001'
+        assert results[0].total_sell_qty == 1000
+        assert results[0].num_cancelled_orders == 3
+        assert ('ACC001', 'IBM') in state.flagged
+    
+    def test_flagged_group_not_reported_again(self):
+        """Test that later data for a flagged group adds no detections"""
+        state = DetectionState()
+        detect_incremental(_layering_rows(), state)
+        
+        later = _layering_rows(base_time=datetime(2025, 10, 26, 11, 0, 0))
+        assert detect_incremental(later, state) == []
+    
+    def test_old_rows_dropped_from_state(self):
+        """Test that rows outside the pattern span are not kept"""
+        rows = _layering_rows()
+        state = DetectionState()
+        detect_incremental(rows.iloc[:3], state)
+        
+        later = rows.iloc[3:6].copy()
+        later['timestamp'] = later['timestamp'] + timedelta(minutes=5)
+        detect_incremental(later, state)
+        
+        group_state = state.groups[('ACC001', 'IBM')]
+        assert len(group_state['rows']) == 3
+        assert group_state['num_cancelled_orders'] == 3
+    
+    def test_special_account_flagging(self):
+        """Test that ACC050 is flagged on first appearance"""
+        state = DetectionState()
+        results = detect_incremental(_layering_rows('ACC050').iloc[:1], state)
+        
+        assert len(results) == 1
+        assert results[0].account_id == 'ACC050'
+
+
+class TestStateFile:
+    """Test state persistence between runs"""
+    
+    def test_state_round_trip(self, tmp_path):
+        """Test that saved state resumes pending groups"""
+        input_file = tmp_path / 'transactions.csv'
+        input_file.write_text('x' * 100)
+        state_path = str(tmp_path / 'state.json')
+        
+        state = DetectionState(input_file=str(input_file), offset=100)
+        detect_incremental(_layering_rows().iloc[:4], state)
+        save_state(state, state_path)
+        
+        resumed = load_state(state_path, str(input_file))
+        results = detect_incremental(_layering_rows().iloc[4:], resumed)
+        
+        assert resumed.offset == 100
+        assert len(results) == 1
+    
+    def test_state_round_trip_fractional_timestamps(self, tmp_path):
+        """Test that whole-second and sub-second timestamps both reload"""
+        input_file = tmp_path / 'transactions.csv'
+        input_file.write_text('x' * 100)
+        state_path = str(tmp_path / 'state.json')
+        
+        rows = _layering_rows()
+        rows['timestamp'] = pd.to_datetime(rows['timestamp']).dt.tz_localize('UTC')
+        rows.loc[1, 'timestamp'] += timedelta(milliseconds=500)
+        
+        state = DetectionState(input_file=str(input_file), offset=100)
+        detect_incremental(rows.iloc[:4], state)
+        save_state(state, state_path)
+        
+        results = detect_incremental(rows.iloc[4:], load_state(state_path, str(input_file)))
+        assert len(results) == 1
+    
+    def test_replaced_input_resets_state(self, tmp_path):
+        """Test that a longer file with different content starts over"""
+        input_file = tmp_path / 'transactions.csv'
+        input_file.write_text('x' * 100)
+        state_path = str(tmp_path / 'state.json')
+        save_state(DetectionState(input_file=str(input_file), offset=100), state_path)
+        
+        input_file.write_text('y' * 200)
+        assert load_state(state_path, str(input_file)).offset == 0
+    
+    def test_malformed_state_file(self, tmp_path):
+        """Test that a state file missing fields raises ValueError"""
+        state_path = tmp_path / 'state.json'
+        state_path.write_text('{"input_file": "transactions.csv"}')
+        
+        with pytest.raises(ValueError, match="Failed to read state file"):
+            load_state(str(state_path), 'transactions.csv')
+    
+    def test_truncated_input_resets_state(self, tmp_path):
+        """Test that a replaced input file is processed from the start"""
+        input_file = tmp_path / 'transactions.csv'
+        input_file.write_text('x' * 10)
+        state_path = str(tmp_path / 'state.json')
+        save_state(DetectionState(input_file=str(input_file), offset=100), state_path)
+        
+        assert load_state(state_path, str(input_file)).offset == 0
+
+
+class TestReadNewTransactions:
+    """Test reading the appended tail of the input file"""
+    
+    def test_partial_line_left_for_next_run(self, tmp_path):
+        """Test that only complete lines are read"""
+        input_file = tmp_path / 'transactions.csv'
+        header = 'timestamp,account_id,product_id,side,price,quantity,event_type\n'
+        line = '2025-10-26T10:21:20Z,ACC001,IBM,BUY,141.20,5000,ORDER_PLACED\n'
+        input_file.write_text(header + line + line[:20])
+        
+        df, offset = read_new_transactions(str(input_file))
+        assert len(df) == 1
+        assert offset == len(header + line)
+        
+        with open(input_file, 'a') as f:
+            f.write(line[20:])
+        df, offset = read_new_transactions(str(input_file), offset)
+        assert len(df) == 1
+        assert df['account_id'].iloc[0] == 'ACC001'
+        assert offset == len(header + line + line)
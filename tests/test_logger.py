@@ -0,0 +1,109 @@
+"""Tests for logging utilities"""
+import json
+import logging
+import pytest
+from layering_detector.config import LOGGING
+from layering_detector.utils.logger import (
+    setup_logger, shutdown_logger, RateLimitFilter, JsonFormatter
+)
+
+
+def _make_record(msg, args=(), created=0.0):
+    record = logging.LogRecord('test', logging.WARNING, __file__, 1, msg, args, None)
+    record.created = created
+    return record
+
+
+class TestRateLimitFilter:
+    """Test per-key rate limiting"""
+    
+    def test_limits_repeated_messages(self):
+        """Test that records over the limit are dropped and counted"""
+        rate_filter = RateLimitFilter(max_count=2, interval=60)
+        passed = [rate_filter.filter(_make_record("Layering detected: %s", (i,)))
+                  for i in range(5)]
+        
+        assert passed == [True, True, False, False, False]
+        assert rate_filter.pop_suppressed() == {"Layering detected: %s": 3}
+        assert rate_filter.pop_suppressed() == {}
+    
+    def test_keys_limited_independently(self):
+        """Test that different message templates have separate limits"""
+        rate_filter = RateLimitFilter(max_count=1, interval=60)
+        
+        assert rate_filter.filter(_make_record("Flagged (special): %s", ('A',)))
+        assert rate_filter.filter(_make_record("Layering detected: %s", ('A',)))
+        assert not rate_filter.filter(_make_record("Layering detected: %s", ('B',)))
+    
+    def test_new_interval_reports_suppressed(self):
+        """Test that the first record of a new interval carries the summary"""
+        rate_filter = RateLimitFilter(max_count=1, interval=10)
+        rate_filter.filter(_make_record("msg", created=0))
+        rate_filter.filter(_make_record("msg", created=1))
+        rate_filter.filter(_make_record("msg", created=2))
+        
+        record = _make_record("msg", created=11)
+        assert rate_filter.filter(record)
+        assert record.suppressed == 2
+    
+    def test_expired_windows_evicted_and_reported(self, caplog):
+        """Test that quiet keys are dropped and their counts logged"""
+        rate_filter = RateLimitFilter(max_count=1, interval=10)
+        rate_filter.filter(_make_record("quiet", created=0))
+        rate_filter.filter(_make_record("quiet", created=1))
+        
+        with caplog.at_level(logging.INFO, logger='test'):
+            assert rate_filter.filter(_make_record("other", created=20))
+        
+        assert "quiet" not in rate_filter._windows
+        assert caplog.messages == ["Suppressed 1 message(s) like: quiet"]
+
+
+class TestJsonFormatter:
+    """Test structured log output"""
+    
+    def test_includes_extra_fields(self):
+        """Test that JSON output contains message and extra fields"""
+        record = _make_record("Layering detected: %s - %s", ('ACC001', 'IBM'))
+        record.account_id = 'ACC001'
+        entry = json.loads(JsonFormatter().format(record))
+        
+        assert entry['level'] == 'WARNING'
+        assert entry['message'] == 'Layering detected: ACC001 - IBM'
+        assert entry['account_id'] == 'ACC001'
+
+
+class TestSetupLogger:
+    """Test logger setup and shutdown"""
+    
+    @pytest.mark.parametrize('async_mode', [True, False])
+    def test_writes_log_file(self, tmp_path, async_mode):
+        """Test that records reach the log file in both modes"""
+        log_file = tmp_path / 'detection.log'
+        logger = setup_logger(str(log_file), name=f'test_{async_mode}',
+                              async_mode=async_mode, json_format=True)
+        total = LOGGING.RATE_LIMIT_COUNT + 10
+        for i in range(total):
+            logger.warning("Layering detected: %s", f'ACC{i:03d}')
+        shutdown_logger(logger)
+        
+        entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert len(entries) == LOGGING.RATE_LIMIT_COUNT + 1
+        assert entries[-1]['message'] == "Suppressed 10 message(s) like: Layering detected: %s"
+        assert not logger.handlers
+    
+    @pytest.mark.parametrize('async_mode', [True, False])
+    def test_json_exception_field(self, tmp_path, async_mode):
+        """Test that tracebacks go to exc_info, not message, in both modes"""
+        log_file = tmp_path / 'detection.log'
+        logger = setup_logger(str(log_file), name=f'test_exc_{async_mode}',
+                              async_mode=async_mode, json_format=True)
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError as e:
+            logger.error("Unexpected error: %s", e, exc_info=True)
+        shutdown_logger(logger)
+        
+        entry = json.loads(log_file.read_text().splitlines()[0])
+        assert entry['message'] == 'Unexpected error: boom'
+        assert 'RuntimeError: boom' in entry['exc_info']